@@ -4,7 +4,224 @@ Each agent has: wallet, skills, reputation, transaction history
 Can post jobs, bid on jobs, perform work
 """
 
-import random
+import itertools
+import logging
+import threading
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Integer skill IDs index into BASE_PRICES; the last slot is the
+# default price for unknown skills
+SKILL_IDS = {
+    'data_analysis': 0,
+    'image_generation': 1,
+    'text_generation': 2,
+    'code_review': 3,
+    'validation': 4,
+}
+DEFAULT_SKILL_ID = 5
+
+# Base token price per skill (reputation scales these)
+BASE_PRICE_TABLE = {
+    'data_analysis': 10,
+    'image_generation': 8,
+    'text_generation': 6,
+    'code_review': 12,
+    'validation': 2,
+}
+DEFAULT_BASE_PRICE = 5
+
+_SEP = "=" * 60
+
+log = logging.getLogger("agenthub.agent")
+
+# Monotonic job ID source: collision-free, sortable, cheaper than RNG
+_job_counter = itertools.count(1)
+
+if NUMPY_AVAILABLE:
+    # float64, not float32: prices surface in displays and on-chain
+    # bid amounts, and float32 rounding artifacts would leak into them
+    # (9.42 becomes 9.420000076293945 through round-tripping)
+    BASE_PRICES = np.array([10, 8, 6, 12, 2, 5], dtype=np.float64)
+
+    def _compute_pricing(skill_ids, reputation):
+        """Price all skills in one vectorized pass"""
+        return np.round(BASE_PRICES[skill_ids] * (reputation / 5.0), 2)
+
+    if NUMBA_AVAILABLE:
+        _compute_pricing = njit(cache=True)(_compute_pricing)
+
+
+class AgentPool:
+    """
+    Structure-of-arrays store for agent numeric state
+
+    Each field is a parallel column indexed by agent slot, so
+    marketplace-wide analytics (completion rates, reputation averages,
+    top-N rankings) reduce over contiguous arrays instead of chasing
+    attribute pointers across thousands of Agent objects.
+    """
+
+    def __init__(self):
+        self.agent_ids = []
+        self.balance = []
+        self.reputation = []
+        self.jobs_completed = []
+        self.jobs_requested = []
+        self.total_earned = []
+        self.total_spent = []
+        self.active_jobs_count = []
+        self.is_seller = []
+        self.skill_mask = []
+        self.pricing_matrix = []
+        # Exact skill names and prices per agent: every skill outside
+        # SKILL_IDS shares the default column, so matching by column
+        # alone would let one unmapped skill bid on all unmapped types
+        self.skill_sets = []
+        self.pricing_map = []
+
+    NUM_SKILLS = DEFAULT_SKILL_ID + 1
+
+    def add(self, agent_id):
+        """Allocate a slot for a new agent, returns its index"""
+        idx = len(self.agent_ids)
+        self.agent_ids.append(agent_id)
+        self.balance.append(0)
+        self.reputation.append(5.0)
+        self.jobs_completed.append(0)
+        self.jobs_requested.append(0)
+        self.total_earned.append(0)
+        self.total_spent.append(0)
+        self.active_jobs_count.append(0)
+        self.is_seller.append(False)
+        self.skill_mask.append([False] * self.NUM_SKILLS)
+        self.pricing_matrix.append([0.0] * self.NUM_SKILLS)
+        self.skill_sets.append(frozenset())
+        self.pricing_map.append({})
+        return idx
+
+    def set_skills(self, idx, skills, pricing, is_seller):
+        """Record an agent's skill mask and per-skill pricing row"""
+        self.is_seller[idx] = is_seller
+        mask = [False] * self.NUM_SKILLS
+        prices = [0.0] * self.NUM_SKILLS
+        for skill in skills:
+            skill_id = SKILL_IDS.get(skill, DEFAULT_SKILL_ID)
+            mask[skill_id] = True
+            prices[skill_id] = pricing.get(skill, 0.0)
+        self.skill_mask[idx] = mask
+        self.pricing_matrix[idx] = prices
+        self.skill_sets[idx] = frozenset(skills)
+        self.pricing_map[idx] = dict(pricing)
+
+    def bid_all(self, job_type, budget, exclude_agent_id=None):
+        """
+        Compute bids from every eligible agent in one vectorized pass
+
+        Args:
+            job_type: Type of service required
+            budget: Maximum payment (bids are capped at budget - 1)
+            exclude_agent_id: Agent to skip (usually the job poster)
+        Returns: (agent_ids, prices, reputations, completion_rates)
+            for agents with a valid bid
+        """
+        type_id = SKILL_IDS.get(job_type)
+        rates = self.calculate_completion_rate_all()
+
+        if type_id is None:
+            # Unmapped job type: its column is the shared default
+            # bucket, which aliases every unmapped skill, so match on
+            # the exact skill sets instead
+            bidders, prices, reputations, bidder_rates = [], [], [], []
+            for i, agent_id in enumerate(self.agent_ids):
+                if agent_id == exclude_agent_id or not self.is_seller[i]:
+                    continue
+                if job_type not in self.skill_sets[i]:
+                    continue
+                price = min(self.pricing_map[i].get(job_type, 0.0),
+                            budget - 1)
+                if price <= 0:
+                    continue
+                bidders.append(agent_id)
+                prices.append(price)
+                reputations.append(self.reputation[i])
+                bidder_rates.append(rates[i])
+            return bidders, prices, reputations, bidder_rates
+
+        if NUMPY_AVAILABLE:
+            has_skill = np.asarray(self.skill_mask, dtype=bool)[:, type_id]
+            prices = np.minimum(
+                np.asarray(self.pricing_matrix, dtype=np.float64)[:, type_id],
+                budget - 1
+            )
+            eligible = has_skill & (prices > 0) & np.asarray(self.is_seller, dtype=bool)
+            if exclude_agent_id is not None:
+                eligible &= np.asarray(self.agent_ids) != exclude_agent_id
+            indices = np.nonzero(eligible)[0]
+            reputations = np.asarray(self.reputation, dtype=np.float64)[indices]
+            return (
+                [self.agent_ids[i] for i in indices],
+                prices[indices].tolist(),
+                reputations.tolist(),
+                rates[indices].tolist()
+            )
+
+        bidders, prices, reputations, bidder_rates = [], [], [], []
+        for i, agent_id in enumerate(self.agent_ids):
+            if agent_id == exclude_agent_id or not self.is_seller[i]:
+                continue
+            if not self.skill_mask[i][type_id]:
+                continue
+            price = min(self.pricing_matrix[i][type_id], budget - 1)
+            if price <= 0:
+                continue
+            bidders.append(agent_id)
+            prices.append(price)
+            reputations.append(self.reputation[i])
+            bidder_rates.append(rates[i])
+        return bidders, prices, reputations, bidder_rates
+
+    def calculate_completion_rate_all(self):
+        """Completion rate for every agent in one vectorized pass
+
+        Matches Agent._calculate_completion_rate: an agent with no
+        jobs yet counts as a full completion rate.
+        """
+        if NUMPY_AVAILABLE:
+            completed = np.asarray(self.jobs_completed, dtype=np.float64)
+            active = np.asarray(self.active_jobs_count, dtype=np.float64)
+            total = completed + active
+            return np.where(total > 0, completed / np.maximum(total, 1), 1.0)
+        return [
+            completed / (completed + active) if completed + active else 1.0
+            for completed, active in zip(self.jobs_completed, self.active_jobs_count)
+        ]
+
+
+# Agents created without an explicit pool share this one
+_default_pool = AgentPool()
+
+
+def _pool_field(name):
+    """Property routing an Agent attribute to its AgentPool column"""
+    def getter(self):
+        return getattr(self._pool, name)[self._idx]
+
+    def setter(self, value):
+        getattr(self._pool, name)[self._idx] = value
+
+    return property(getter, setter)
 
 
 class Agent:
@@ -15,39 +232,65 @@ class Agent:
     - Skill set and pricing
     - Reputation system
     - Transaction history
+
+    Numeric state lives in an AgentPool (structure-of-arrays); the
+    attributes below are thin views into the pool's columns.
     """
-    
-    def __init__(self, agent_id, agent_type, skills, initial_balance=100):
+
+    __slots__ = (
+        '_pool', '_idx', 'agent_id', 'agent_type', 'skills', 'active_jobs',
+        'pricing', '_skill_ids', '_base_prices',
+        '_completion_rate_cached', '_completion_rate_dirty', '_wallet_lock'
+    )
+
+    balance = _pool_field('balance')
+    reputation_score = _pool_field('reputation')
+    jobs_completed = _pool_field('jobs_completed')
+    jobs_requested = _pool_field('jobs_requested')
+    total_earned = _pool_field('total_earned')
+    total_spent = _pool_field('total_spent')
+
+    def __init__(self, agent_id, agent_type, skills, initial_balance=100, pool=None):
+        self._pool = pool if pool is not None else _default_pool
+        self._idx = self._pool.add(agent_id)
         self.agent_id = agent_id
         self.agent_type = agent_type  # 'buyer', 'seller', or 'validator'
         self.skills = skills  # List of services this agent can provide
         self.balance = initial_balance
-        self.reputation_score = 5.0  # Out of 5 stars
-        self.jobs_completed = 0
-        self.jobs_requested = 0
-        self.total_earned = 0
-        self.total_spent = 0
         self.active_jobs = []
+        self._completion_rate_cached = 1.0
+        self._completion_rate_dirty = True
+        # Balance updates are read-modify-write; the lock keeps them
+        # atomic when job cycles run concurrently
+        self._wallet_lock = threading.Lock()
+        if NUMPY_AVAILABLE:
+            self._skill_ids = np.array(
+                [SKILL_IDS.get(skill, DEFAULT_SKILL_ID) for skill in self.skills],
+                dtype=np.int8
+            )
+            self._base_prices = BASE_PRICES[self._skill_ids]
+        else:
+            self._base_prices = [
+                BASE_PRICE_TABLE.get(skill, DEFAULT_BASE_PRICE)
+                for skill in self.skills
+            ]
         self.pricing = self._generate_pricing()
-    
+        self._pool.set_skills(self._idx, self.skills, self.pricing,
+                              self.agent_type == 'seller')
+
     def _generate_pricing(self):
         """Generate pricing for each skill based on reputation"""
-        pricing = {}
-        base_prices = {
-            'data_analysis': 10,
-            'image_generation': 8,
-            'text_generation': 6,
-            'code_review': 12,
-            'validation': 2
+        if NUMPY_AVAILABLE:
+            # Single vectorized (optionally JIT-compiled) kernel for all skills
+            prices = _compute_pricing(self._skill_ids, self.reputation_score)
+            return {skill: float(price) for skill, price in zip(self.skills, prices)}
+
+        # Higher reputation = higher prices
+        reputation_multiplier = self.reputation_score / 5.0
+        return {
+            skill: round(base * reputation_multiplier, 2)
+            for skill, base in zip(self.skills, self._base_prices)
         }
-        
-        for skill in self.skills:
-            base = base_prices.get(skill, 5)
-            # Higher reputation = higher prices
-            reputation_multiplier = self.reputation_score / 5.0
-            pricing[skill] = round(base * reputation_multiplier, 2)
-        
-        return pricing
     
     def post_job(self, job_description, job_type, budget):
         """
@@ -59,11 +302,11 @@ class Agent:
         Returns: Job posting dict
         """
         if self.balance < budget:
-            print(f"❌ {self.agent_id}: Insufficient balance for job posting")
+            log.info("❌ %s: Insufficient balance for job posting", self.agent_id)
             return None
         
         job = {
-            'job_id': f"job_{random.randint(1000, 9999)}",
+            'job_id': f"job_{next(_job_counter):08x}",
             'poster': self.agent_id,
             'description': job_description,
             'type': job_type,
@@ -72,10 +315,10 @@ class Agent:
             'bids': []
         }
         
-        print(f"\n📢 {self.agent_id} posted job: {job['job_id']}")
-        print(f"   Type: {job_type}")
-        print(f"   Budget: {budget} tokens")
-        print(f"   Description: {job_description}")
+        log.info("\n📢 %s posted job: %s", self.agent_id, job['job_id'])
+        log.info("   Type: %s", job_type)
+        log.info("   Budget: %s tokens", budget)
+        log.info("   Description: %s", job_description)
         
         return job
     
@@ -109,42 +352,53 @@ class Agent:
             'completion_rate': self._calculate_completion_rate()
         }
         
-        print(f"   💰 {self.agent_id} bid {bid_price} tokens (reputation: {self.reputation_score:.1f}⭐)")
+        if log.isEnabledFor(logging.INFO):
+            log.info("   💰 %s bid %s tokens (reputation: %.1f⭐)",
+                     self.agent_id, bid_price, self.reputation_score)
         
         return bid
     
+    # Static work outputs, frozen at class level so perform_work doesn't
+    # rebuild the dict (and evaluate every f-string) on each call
+    _STATIC_OUTPUTS = {
+        'data_analysis': "Analysis complete: Dataset processed, key insights extracted. Correlation: 0.85",
+        'text_generation': "Content created: Professional text matching requirements",
+        'code_review': "Code review complete: 3 issues found, 5 improvements suggested",
+        'validation': "Validation complete: Quality metrics calculated",
+    }
+
     def perform_work(self, job_description):
         """
         Simulate performing work
         Returns: Work output (string)
         """
-        outputs = {
-            'data_analysis': f"Analysis complete: Dataset processed, key insights extracted. Correlation: 0.85",
-            'image_generation': f"Image generated: High-quality visual based on prompt '{job_description}'",
-            'text_generation': f"Content created: Professional text matching requirements",
-            'code_review': f"Code review complete: 3 issues found, 5 improvements suggested",
-            'validation': f"Validation complete: Quality metrics calculated"
-        }
-        
         # Return generic output based on agent's primary skill
         skill = self.skills[0] if self.skills else 'generic'
-        return outputs.get(skill, "Work completed successfully")
+        if skill == 'image_generation':
+            # Only this output interpolates the job description
+            return f"Image generated: High-quality visual based on prompt '{job_description}'"
+        return self._STATIC_OUTPUTS.get(skill, "Work completed successfully")
     
     def receive_payment(self, amount):
         """Receive payment for completed work"""
-        self.balance += amount
-        self.total_earned += amount
-        self.jobs_completed += 1
-        print(f"   💵 {self.agent_id} received {amount} tokens (balance: {self.balance})")
+        with self._wallet_lock:
+            self.balance += amount
+            self.total_earned += amount
+            self.jobs_completed += 1
+            self._completion_rate_dirty = True
+        if log.isEnabledFor(logging.INFO):
+            log.info("   💵 %s received %s tokens (balance: %s)",
+                     self.agent_id, amount, self.balance)
     
     def make_payment(self, amount):
         """Make payment for received work"""
-        if self.balance >= amount:
-            self.balance -= amount
-            self.total_spent += amount
-            self.jobs_requested += 1
-            return True
-        return False
+        with self._wallet_lock:
+            if self.balance >= amount:
+                self.balance -= amount
+                self.total_spent += amount
+                self.jobs_requested += 1
+                return True
+            return False
     
     def update_reputation(self, quality_score):
         """
@@ -159,14 +413,49 @@ class Agent:
         weight = 0.2  # New rating has 20% weight
         self.reputation_score = (self.reputation_score * (1 - weight)) + (new_rating * weight)
         
-        print(f"   ⭐ {self.agent_id} reputation updated: {self.reputation_score:.2f}/5.00")
+        # Refresh pricing incrementally: one multiply per skill against
+        # the cached base prices instead of rebuilding from scratch
+        if self.skills:
+            rep_over_5 = self.reputation_score / 5.0
+            if NUMPY_AVAILABLE:
+                prices = np.round(self._base_prices * rep_over_5, 2)
+                self.pricing = {
+                    skill: float(price) for skill, price in zip(self.skills, prices)
+                }
+            else:
+                self.pricing = {
+                    skill: round(base * rep_over_5, 2)
+                    for skill, base in zip(self.skills, self._base_prices)
+                }
+            self._pool.set_skills(self._idx, self.skills, self.pricing,
+                                  self.agent_type == 'seller')
+
+        if log.isEnabledFor(logging.INFO):
+            log.info("   ⭐ %s reputation updated: %.2f/5.00",
+                     self.agent_id, self.reputation_score)
     
+    def add_active_job(self, job_id):
+        """Track a job in progress (keeps the pool counter in sync)"""
+        self.active_jobs.append(job_id)
+        self._pool.active_jobs_count[self._idx] = len(self.active_jobs)
+        self._completion_rate_dirty = True
+
+    def remove_active_job(self, job_id):
+        """Stop tracking a job in progress"""
+        if job_id in self.active_jobs:
+            self.active_jobs.remove(job_id)
+            self._pool.active_jobs_count[self._idx] = len(self.active_jobs)
+            self._completion_rate_dirty = True
+
     def _calculate_completion_rate(self):
-        """Calculate job completion rate"""
-        total_jobs = self.jobs_completed + len(self.active_jobs)
-        if total_jobs == 0:
-            return 1.0
-        return self.jobs_completed / total_jobs
+        """Calculate job completion rate (cached until state changes)"""
+        if self._completion_rate_dirty:
+            total_jobs = self.jobs_completed + len(self.active_jobs)
+            self._completion_rate_cached = (
+                1.0 if total_jobs == 0 else self.jobs_completed / total_jobs
+            )
+            self._completion_rate_dirty = False
+        return self._completion_rate_cached
     
     def get_stats(self):
         """Get agent statistics"""
@@ -184,22 +473,22 @@ class Agent:
     
     def display_profile(self):
         """Display agent profile"""
-        print(f"\n{'='*60}")
-        print(f"AGENT PROFILE: {self.agent_id}")
-        print(f"{'='*60}")
-        print(f"Type: {self.agent_type.upper()}")
-        print(f"Skills: {', '.join(self.skills)}")
-        print(f"Balance: {self.balance} tokens")
-        print(f"Reputation: {self.reputation_score:.2f} ⭐")
-        print(f"Jobs Completed: {self.jobs_completed}")
-        print(f"Jobs Requested: {self.jobs_requested}")
-        print(f"Total Earned: {self.total_earned} tokens")
-        print(f"Total Spent: {self.total_spent} tokens")
-        print(f"Completion Rate: {self._calculate_completion_rate() * 100:.1f}%")
+        log.info(f"\n{_SEP}")
+        log.info(f"AGENT PROFILE: {self.agent_id}")
+        log.info(f"{_SEP}")
+        log.info(f"Type: {self.agent_type.upper()}")
+        log.info(f"Skills: {', '.join(self.skills)}")
+        log.info(f"Balance: {self.balance} tokens")
+        log.info(f"Reputation: {self.reputation_score:.2f} ⭐")
+        log.info(f"Jobs Completed: {self.jobs_completed}")
+        log.info(f"Jobs Requested: {self.jobs_requested}")
+        log.info(f"Total Earned: {self.total_earned} tokens")
+        log.info(f"Total Spent: {self.total_spent} tokens")
+        log.info(f"Completion Rate: {self._calculate_completion_rate() * 100:.1f}%")
         
         if self.pricing:
-            print(f"\nPricing:")
+            log.info(f"\nPricing:")
             for skill, price in self.pricing.items():
-                print(f"  - {skill}: {price} tokens")
+                log.info(f"  - {skill}: {price} tokens")
         
-        print(f"{'='*60}\n")
+        log.info(f"{_SEP}\n")
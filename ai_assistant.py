@@ -11,14 +11,42 @@ import warnings
 warnings.filterwarnings('ignore')
 
 try:
-    from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
+    from transformers import (
+        pipeline, AutoTokenizer, AutoModelForCausalLM,
+        StoppingCriteria, StoppingCriteriaList
+    )
     from sentence_transformers import SentenceTransformer
     import torch
+    import numpy as np
     AI_AVAILABLE = True
 except ImportError:
     AI_AVAILABLE = False
     print("⚠️  AI libraries not installed. Chat assistant will use templates.")
 
+if AI_AVAILABLE:
+    class _StopOnTokens(StoppingCriteria):
+        """Stop decoding once a stop token appears past the prompt
+
+        distilgpt2 tends to answer in one line and then ramble; cutting
+        at the first newline saves the remaining token budget.
+        """
+
+        def __init__(self, stop_ids, prompt_len):
+            self.stop_ids = stop_ids
+            self.prompt_len = prompt_len
+            # Rows of the batch that have emitted a stop token; the
+            # criteria API halts all sequences at once, so wait until
+            # every row has finished its line
+            self._finished = set()
+
+        def __call__(self, input_ids, scores, **kwargs):
+            if input_ids.shape[1] <= self.prompt_len:
+                return False
+            for row, token in enumerate(input_ids[:, -1].tolist()):
+                if token in self.stop_ids:
+                    self._finished.add(row)
+            return len(self._finished) == input_ids.shape[0]
+
 try:
     import chromadb
     from chromadb.config import Settings
@@ -27,9 +55,56 @@ except ImportError:
     RAG_AVAILABLE = False
     print("⚠️  ChromaDB not installed. RAG features will be disabled.")
 
+# Optional: ONNX Runtime backend for faster CPU generation
+try:
+    from optimum.onnxruntime import ORTModelForCausalLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# Optional: FAISS ANN index, worthwhile once the KB grows past a few
+# hundred topics (sublinear lookup + SIMD-heavy inner-product kernels)
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Optional: Aho-Corasick automaton for single-pass keyword matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional: sparse bag-of-words scoring for keyword matches
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Optional: int8 weight-only quantization for the GPU chat path
+try:
+    import bitsandbytes  # noqa: F401 — presence check only
+    BNB_AVAILABLE = True
+except ImportError:
+    BNB_AVAILABLE = False
+
+import asyncio
+import copy
+import functools
+import hashlib
+import logging
 import os
+import re
+import threading
+from collections import Counter
 from pathlib import Path
 
+log = logging.getLogger("agenthub.assistant")
+
 
 class AIAssistant:
     """
@@ -42,55 +117,333 @@ class AIAssistant:
     4. Answer marketplace questions
     """
     
-    def __init__(self, use_gpu=False):
-        """Initialize AI assistant with local models"""
-        self.device = 'cuda' if use_gpu and torch.cuda.is_available() else 'cpu'
+    # Cached topic embeddings live next to the code so repeated starts
+    # skip re-encoding the (static) knowledge base
+    KB_CACHE_DIR = Path(__file__).parent
+
+    # Static prompt header shared by every chat turn; its attention state
+    # is computed once and reused (see _warm_prompt_prefix)
+    PROMPT_PREFIX = "AgentHub is a blockchain-powered marketplace for AI agents. \nUser: "
+
+    def __init__(self, use_gpu=False, do_sample=True, int8_weights=True):
+        """
+        Initialize AI assistant (cheap constructor)
+
+        Heavy models are loaded lazily on first use so template-only
+        sessions never pay the startup or memory cost of the transformers.
+
+        Args:
+            use_gpu: Whether to use GPU acceleration (if available)
+            do_sample: Sample generations (False gives deterministic greedy decode)
+            int8_weights: Allow int8 weight-only GPU load via bitsandbytes
+                (disable for batched short-decode workloads where it can lose)
+        """
+        self.use_gpu = use_gpu
+        self.do_sample = do_sample
+        self.int8_weights = int8_weights
         self.rag_enabled = False  # Initialize early for all modes
-        
-        if not AI_AVAILABLE:
-            print("⚠️  AI Assistant running in template mode")
-            self.ai_enabled = False
-            self._load_templates()
+        self.ai_enabled = AI_AVAILABLE
+
+        # Lazily-populated model handles
+        self.tokenizer = None
+        self.chat_model = None
+        self.semantic_model = None
+        self.topic_embeddings = None
+        self.topic_index = None
+        self._prefix_ids = None
+        self._prefix_past = None
+        self._chat_model_loaded = False
+        self._semantic_model_loaded = False
+        self._rag_initialized = False
+
+        if AI_AVAILABLE:
+            self.device = 'cuda' if use_gpu and torch.cuda.is_available() else 'cpu'
+        else:
+            self.device = 'cpu'
+            log.info("⚠️  AI Assistant running in template mode")
+
+        self._load_templates()
+
+    def _ensure_rag(self):
+        """Initialize the RAG document store on first use
+
+        Template-only sessions never touch ChromaDB (or the encoder it
+        pulls in), so get_assistant() returns instantly.
+        """
+        if self._rag_initialized:
             return
-        
-        self.ai_enabled = True
-        print(f"🤖 Initializing AI Assistant on {self.device.upper()}...")
-        
+        self._rag_initialized = True
+        if AI_AVAILABLE and RAG_AVAILABLE:
+            log.info("   Initializing RAG document store...")
+            try:
+                self._initialize_rag()
+                log.info("   ✅ RAG enabled with documentation index")
+            except Exception as e:
+                print(f"   ⚠️  Could not initialize RAG: {e}")
+
+    def _ensure_chat_model(self):
+        """Load the conversational model on first use"""
+        if self._chat_model_loaded or not self.ai_enabled:
+            return
+        self._chat_model_loaded = True
+
         # Model 1: Conversational AI (82MB, fast)
-        print("   Loading conversational model...")
+        log.info("   Loading conversational model...")
         try:
             self.tokenizer = AutoTokenizer.from_pretrained("distilgpt2")
             self.tokenizer.pad_token = self.tokenizer.eos_token
-            self.chat_model = AutoModelForCausalLM.from_pretrained("distilgpt2")
+            self._stop_token_ids = frozenset(
+                self.tokenizer.encode('\n', add_special_tokens=False)
+            )
+
+            # Prefer ONNX Runtime on CPU: fused kernels and no per-token
+            # Python overhead, typically 2-4x faster generate()
+            if ONNX_AVAILABLE and self.device == 'cpu':
+                onnx_model = self._load_onnx_chat_model()
+                if onnx_model is not None:
+                    self.chat_model = onnx_model
+                    return
+
+            # On GPU, int8 weight-only quantization halves bandwidth
+            # again vs bf16 — decode is weight-bandwidth bound, so this
+            # is nearly free accuracy-wise on distilgpt2
+            if self.device == 'cuda' and self.int8_weights and BNB_AVAILABLE:
+                int8_model = self._load_int8_chat_model()
+                if int8_model is not None:
+                    self.chat_model = int8_model
+                    self._warm_prompt_prefix()
+                    return
+
+            # Half-precision halves weight bandwidth; decode on small
+            # batches is memory-bound so this roughly doubles throughput.
+            # SDPA runs attention as one fused kernel (same FLOPs, far
+            # less memory traffic on the KV cache).
+            dtype = self._select_chat_dtype()
+            try:
+                self.chat_model = AutoModelForCausalLM.from_pretrained(
+                    "distilgpt2", torch_dtype=dtype, attn_implementation="sdpa"
+                )
+            except (TypeError, ValueError):
+                # transformers/torch too old for the sdpa kwarg
+                try:
+                    self.chat_model = AutoModelForCausalLM.from_pretrained(
+                        "distilgpt2", torch_dtype=dtype
+                    )
+                except Exception:
+                    # Older hardware without bf16/fp16 support
+                    self.chat_model = AutoModelForCausalLM.from_pretrained("distilgpt2")
             self.chat_model.to(self.device)
             self.chat_model.eval()
+            self.chat_model.config.use_cache = True  # Reuse KV cache during decode
+            # Compile only on CUDA: reduce-overhead uses CUDA graphs to
+            # amortize per-token launch overhead, while on CPU the compile
+            # cost rarely pays for itself on a model this small
+            if self.device == 'cuda':
+                try:
+                    self.chat_model = torch.compile(
+                        self.chat_model, mode='reduce-overhead', fullgraph=False
+                    )
+                    # One throwaway forward triggers compilation now rather
+                    # than on the first user request
+                    warmup = self.tokenizer("warmup", return_tensors="pt")
+                    with torch.inference_mode():
+                        self.chat_model(warmup.input_ids.to(self.device))
+                except Exception:
+                    pass  # torch.compile unavailable (torch < 2.0) — eager is fine
+            self._warm_prompt_prefix()
         except Exception as e:
             print(f"   ⚠️  Could not load chat model: {e}")
             self.chat_model = None
-        
+
+    def _to_device(self, tensor):
+        """Move an input tensor to the model device
+
+        On CUDA the tensor is staged in pinned host memory first so the
+        H2D copy runs async (non_blocking) instead of stalling the
+        stream; on CPU this is a no-op.
+        """
+        if self.device == 'cuda':
+            return tensor.pin_memory().to(self.device, non_blocking=True)
+        return tensor
+
+    def _load_int8_chat_model(self):
+        """Load distilgpt2 with int8 weight-only quantization (GPU)"""
+        try:
+            model = AutoModelForCausalLM.from_pretrained(
+                "distilgpt2", load_in_8bit=True, device_map="auto"
+            )
+            model.eval()
+            model.config.use_cache = True
+            log.info("   ✅ Chat model loaded with int8 weights")
+            return model
+        except Exception as e:
+            log.info("   ⚠️  int8 load unavailable, using half precision: %s", e)
+            return None
+
+    def _select_chat_dtype(self):
+        """Pick the widest dtype the hardware natively accelerates
+
+        bf16 keeps fp32's exponent range (no loss-of-scale surprises
+        during sampling) but only helps where there are native bf16
+        units: Ampere+ GPUs, or AVX-512 BF16 / AMX CPUs. Elsewhere it
+        is emulated and slower than fp32, so fall back accordingly.
+        """
+        if self.device == 'cuda':
+            if torch.cuda.is_bf16_supported():
+                return torch.bfloat16
+            return torch.float16  # pre-Ampere: fp16 tensor cores only
+        try:
+            if torch.backends.cpu.get_cpu_capability() in ('AVX512', 'AMX'):
+                return torch.bfloat16
+        except AttributeError:
+            pass  # torch < 2.0 can't report CPU capability
+        return torch.float32
+
+    def _warm_prompt_prefix(self):
+        """Run the static prompt prefix through the model once
+
+        Every chat turn shares the same ~15-token header, so its
+        past_key_values are computed at load time; per-turn prefill then
+        only covers the user's tokens.
+        """
+        try:
+            # The encoded ids are useful on their own: even when the KV
+            # warmup below fails, the full-prompt path can still torch.cat
+            # them with the user tokens instead of re-running BPE on the
+            # preamble every turn
+            self._prefix_ids = self.tokenizer(
+                self.PROMPT_PREFIX, return_tensors="pt"
+            ).input_ids.to(self.device)
+        except Exception as e:
+            log.info("   ⚠️  Could not pre-encode prompt prefix: %s", e)
+            return
+        try:
+            with torch.inference_mode():
+                out = self.chat_model(self._prefix_ids, use_cache=True)
+            self._prefix_past = out.past_key_values
+        except Exception as e:
+            log.info("   ⚠️  Prompt-prefix cache unavailable: %s", e)
+            self._prefix_past = None
+
+    def _load_onnx_chat_model(self):
+        """Export distilgpt2 to ONNX once and reuse the cached artifact
+
+        After the fp32 export, the MatMul/Linear weights are
+        dynamically quantized to int8 (VNNI kernels on AVX-512 CPUs),
+        which roughly quarters weight bandwidth on decode. The
+        quantized artifact is cached next to the fp32 one; if
+        quantization fails the fp32 ONNX model is used as-is.
+        """
+        try:
+            cache_root = Path.home() / ".cache" / "agenthub"
+            onnx_dir = cache_root / "distilgpt2-onnx"
+            int8_dir = cache_root / "distilgpt2-onnx-int8"
+
+            if int8_dir.exists():
+                log.info("   ✅ Using int8 ONNX Runtime for chat generation")
+                return ORTModelForCausalLM.from_pretrained(
+                    int8_dir, provider="CPUExecutionProvider"
+                )
+
+            if onnx_dir.exists():
+                model = ORTModelForCausalLM.from_pretrained(
+                    onnx_dir, provider="CPUExecutionProvider"
+                )
+            else:
+                model = ORTModelForCausalLM.from_pretrained(
+                    "distilgpt2", export=True, provider="CPUExecutionProvider"
+                )
+                onnx_dir.parent.mkdir(parents=True, exist_ok=True)
+                model.save_pretrained(onnx_dir)
+
+            quantized = self._quantize_onnx_chat_model(onnx_dir, int8_dir)
+            if quantized is not None:
+                return quantized
+            log.info("   ✅ Using ONNX Runtime for chat generation")
+            return model
+        except Exception as e:
+            print(f"   ⚠️  ONNX export failed, using PyTorch: {e}")
+            return None
+
+    def _quantize_onnx_chat_model(self, onnx_dir, int8_dir):
+        """Dynamic int8 quantization of the exported model (one-time)"""
+        try:
+            quantizer = ORTQuantizer.from_pretrained(onnx_dir)
+            qconfig = AutoQuantizationConfig.avx512_vnni(
+                is_static=False, per_channel=False
+            )
+            quantizer.quantize(save_dir=int8_dir, quantization_config=qconfig)
+            log.info("   ✅ Using int8 ONNX Runtime for chat generation")
+            return ORTModelForCausalLM.from_pretrained(
+                int8_dir, provider="CPUExecutionProvider"
+            )
+        except Exception as e:
+            log.info("   ⚠️  int8 quantization unavailable: %s", e)
+            return None
+
+    def _ensure_semantic_model(self):
+        """Load the semantic search model on first use"""
+        if self._semantic_model_loaded or not self.ai_enabled:
+            return
+        self._semantic_model_loaded = True
+
         # Model 2: Semantic search for help topics (23MB)
-        print("   Loading semantic search...")
+        log.info("   Loading semantic search...")
         try:
             self.semantic_model = SentenceTransformer(
                 'sentence-transformers/all-MiniLM-L6-v2',
                 device=self.device
             )
+            if self.device == 'cuda':
+                # fp16 halves encoder bandwidth; MiniLM is robust to it
+                self.semantic_model.half()
         except Exception as e:
             print(f"   ⚠️  Could not load semantic model: {e}")
             self.semantic_model = None
-        
-        # RAG: Document knowledge base
-        print("   Initializing RAG document store...")
-        self.rag_enabled = False
-        if RAG_AVAILABLE and self.semantic_model:
-            try:
-                self._initialize_rag()
-                print("   ✅ RAG enabled with documentation index")
-            except Exception as e:
-                print(f"   ⚠️  Could not initialize RAG: {e}")
-        
-        self._load_templates()
-        print("✅ AI Assistant ready!\n")
+            return
+
+        # Embed every topic once; memory-map the cache on subsequent starts
+        try:
+            if self._kb_emb_cache.exists():
+                self.topic_embeddings = np.load(self._kb_emb_cache, mmap_mode='r')
+                if self.topic_embeddings.shape[0] != len(self.knowledge_base):
+                    self.topic_embeddings = None  # KB changed, re-encode below
+            if self.topic_embeddings is None:
+                topic_texts = [
+                    ' '.join(data['keywords']) + ' ' + data['response'][:200]
+                    for data in self.knowledge_base.values()
+                ]
+                self.topic_embeddings = self.semantic_model.encode(
+                    topic_texts,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+                np.save(self._kb_emb_cache, self.topic_embeddings)
+        except Exception as e:
+            print(f"   ⚠️  Could not build topic embeddings: {e}")
+            self.topic_embeddings = None
+
+        self._build_topic_index()
+
+    def _build_topic_index(self):
+        """Build (or load) a FAISS HNSW index over the topic embeddings"""
+        self.topic_index = None
+        if not FAISS_AVAILABLE or self.topic_embeddings is None:
+            return
+        try:
+            if self._kb_index_cache.exists():
+                self.topic_index = faiss.read_index(str(self._kb_index_cache))
+                if self.topic_index.ntotal != len(self.knowledge_base):
+                    self.topic_index = None  # KB changed, rebuild below
+            if self.topic_index is None:
+                dim = self.topic_embeddings.shape[1]
+                index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+                index.add(np.ascontiguousarray(self.topic_embeddings, dtype=np.float32))
+                faiss.write_index(index, str(self._kb_index_cache))
+                self.topic_index = index
+        except Exception as e:
+            print(f"   ⚠️  Could not build FAISS topic index: {e}")
+            self.topic_index = None
     
     def _load_templates(self):
         """Load predefined responses for common questions"""
@@ -232,15 +585,84 @@ Benefits:
                 "High-reputation agents get more jobs automatically!"""
             }
         }
-    
+
+        # Freeze keyword lists and cache the reciprocal length used by
+        # the match scoring (multiply beats divide in the per-call path)
+        for data in self.knowledge_base.values():
+            data['keywords'] = tuple(data['keywords'])
+            data['inv_kw_len'] = 1.0 / len(data['keywords'])
+
+        self._build_keyword_automaton()
+
+    def _build_keyword_automaton(self):
+        """Compile all KB keywords into one Aho-Corasick automaton
+
+        Also builds an inverted keyword -> topics index for the
+        pure-Python fallback: each distinct keyword is scanned once per
+        message instead of once per (topic, keyword) pair, keeping the
+        substring semantics ('block' still hits inside 'blockchain').
+        """
+        index = {}
+        for topic, data in self.knowledge_base.items():
+            for keyword in data['keywords']:
+                index.setdefault(keyword, []).append(topic)
+        self._keyword_index = {kw: tuple(topics) for kw, topics in index.items()}
+        # Topic order is shared by the sparse scorer and the semantic
+        # fallback (row i of the embedding matrix is _topic_order[i])
+        self._topic_order = list(self.knowledge_base.keys())
+        self._build_topic_matrix()
+
+        # Key on-disk artifacts to the KB content: editing a template
+        # invalidates stale embedding/index caches automatically
+        kb_hash = hashlib.sha256(repr(self.knowledge_base).encode()).hexdigest()[:16]
+        self._kb_emb_cache = self.KB_CACHE_DIR / f".kb_embeddings_{kb_hash}.npy"
+        self._kb_index_cache = self.KB_CACHE_DIR / f".kb_embeddings_{kb_hash}.faiss"
+
+        self._keyword_automaton = None
+        if not AHOCORASICK_AVAILABLE:
+            return
+        automaton = ahocorasick.Automaton()
+        for topic, data in self.knowledge_base.items():
+            for keyword in data['keywords']:
+                automaton.add_word(keyword, (topic, keyword))
+        automaton.make_automaton()
+        self._keyword_automaton = automaton
+
+    def _build_topic_matrix(self):
+        """Sparse topics x keywords matrix for one-matvec scoring
+
+        Row t holds inv_kw_len at every keyword column belonging to
+        topic t, so topic_matrix @ hit_vector reproduces the Counter
+        scoring in a single sparse matvec.
+        """
+        self._topic_matrix = None
+        if not (SCIPY_AVAILABLE and AI_AVAILABLE):
+            return
+        self._kw_vocab = {kw: i for i, kw in enumerate(self._keyword_index)}
+        topic_pos = {topic: i for i, topic in enumerate(self._topic_order)}
+        rows, cols, vals = [], [], []
+        for topic, data in self.knowledge_base.items():
+            for keyword in data['keywords']:
+                rows.append(topic_pos[topic])
+                cols.append(self._kw_vocab[keyword])
+                vals.append(data['inv_kw_len'])
+        self._topic_matrix = sparse.csr_matrix(
+            (vals, (rows, cols)),
+            shape=(len(self._topic_order), len(self._kw_vocab))
+        )
+
     def _initialize_rag(self):
         """Initialize ChromaDB vector store and index documentation"""
         # Create persistent ChromaDB client
         chroma_dir = Path(__file__).parent / ".chroma_db"
-        self.chroma_client = chromadb.Client(Settings(
-            persist_directory=str(chroma_dir),
-            anonymized_telemetry=False
-        ))
+        try:
+            self.chroma_client = chromadb.PersistentClient(path=str(chroma_dir))
+        except AttributeError:
+            # chromadb < 0.4 — fall back to the legacy Settings form
+            self.chroma_client = chromadb.Client(Settings(
+                persist_directory=str(chroma_dir),
+                anonymized_telemetry=False
+            ))
         
         # Get or create collection
         try:
@@ -248,10 +670,19 @@ Benefits:
             print("   📚 Loaded existing document index")
             self.rag_enabled = True
         except:
-            # Collection doesn't exist, create and index documents
+            # Collection doesn't exist, create and index documents.
+            # The corpus is tiny, so spend more on graph quality at build
+            # time (construction_ef/M) and search wider (search_ef) —
+            # recall goes to ~1.0 and queries stay sub-millisecond.
             self.doc_collection = self.chroma_client.create_collection(
                 name="agenthub_docs",
-                metadata={"description": "AgentHub documentation for RAG"}
+                metadata={
+                    "description": "AgentHub documentation for RAG",
+                    "hnsw:space": "cosine",
+                    "hnsw:construction_ef": 128,
+                    "hnsw:M": 24,
+                    "hnsw:search_ef": 64
+                }
             )
             self._index_documentation()
             self.rag_enabled = True
@@ -297,12 +728,41 @@ Benefits:
                     print(f"      ⚠️  Could not index {doc_file}: {e}")
         
         if documents:
+            # Sort by length first so encode() forms similar-length
+            # mini-batches (less padding waste); order doesn't matter to
+            # the index itself
+            order = sorted(range(len(documents)), key=lambda i: len(documents[i]))
+            documents = [documents[i] for i in order]
+            metadatas = [metadatas[i] for i in order]
+            ids = [ids[i] for i in order]
+
+            # Embed everything here in one batched pass; Chroma then only
+            # does HNSW insertion instead of invoking its embedder chunk
+            # by chunk
+            embeddings = None
+            self._ensure_semantic_model()
+            if self.semantic_model is not None:
+                embeddings = self.semantic_model.encode(
+                    documents,
+                    batch_size=64,
+                    show_progress_bar=False,
+                    normalize_embeddings=True
+                ).tolist()
+
             # Add to ChromaDB
-            self.doc_collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
+            if embeddings is not None:
+                self.doc_collection.add(
+                    documents=documents,
+                    metadatas=metadatas,
+                    ids=ids,
+                    embeddings=embeddings
+                )
+            else:
+                self.doc_collection.add(
+                    documents=documents,
+                    metadatas=metadatas,
+                    ids=ids
+                )
             print(f"   ✅ Indexed {len(documents)} document chunks")
     
     def _split_document(self, content: str, filename: str) -> list:
@@ -312,6 +772,7 @@ Benefits:
         # Split by markdown headers (##, ###, etc.)
         lines = content.split('\n')
         current_chunk = []
+        current_len = 0  # running size; avoids re-joining the chunk per line
         current_header = ""
         
         for line in lines:
@@ -326,15 +787,18 @@ Benefits:
                 # Start new chunk with header
                 current_header = line
                 current_chunk = [line]
+                current_len = len(line)
             else:
                 current_chunk.append(line)
+                current_len += len(line) + 1  # +1 for the joining newline
             
             # Also split on very long chunks (>1000 chars)
-            if len('\n'.join(current_chunk)) > 1000:
+            if current_len > 1000:
                 chunk_text = '\n'.join(current_chunk).strip()
                 if len(chunk_text) > 50:
                     chunks.append(chunk_text)
                 current_chunk = []
+                current_len = 0
         
         # Add final chunk
         if current_chunk:
@@ -350,10 +814,23 @@ Benefits:
             return []
         
         try:
-            results = self.doc_collection.query(
-                query_texts=[query],
-                n_results=n_results
-            )
+            # Encode the query with our already-warm model and hand Chroma
+            # the vector directly; query_texts= would make it spin up its
+            # own embedder for every chat turn
+            self._ensure_semantic_model()
+            if self.semantic_model is not None:
+                q_emb = self.semantic_model.encode(
+                    [query], normalize_embeddings=True
+                )
+                results = self.doc_collection.query(
+                    query_embeddings=q_emb.tolist(),
+                    n_results=n_results
+                )
+            else:
+                results = self.doc_collection.query(
+                    query_texts=[query],
+                    n_results=n_results
+                )
             
             if results and results['documents']:
                 return [
@@ -394,23 +871,37 @@ Benefits:
         
         # For longer context, try to extract the most relevant part
         # Split into paragraphs and find most relevant
-        paragraphs = combined_context.split('\n\n')
+        paragraphs = [p for p in combined_context.split('\n\n') if len(p) >= 30]
+        if not paragraphs:
+            return combined_context[:800] + "..."
+
+        # Prefer semantic scoring: one batched encode + a single matmul
+        # ranks all paragraphs against the query at once
+        self._ensure_semantic_model()
+        if self.semantic_model is not None:
+            try:
+                embs = self.semantic_model.encode(
+                    [query] + paragraphs,
+                    batch_size=32,
+                    normalize_embeddings=True
+                )
+                scores = embs[0] @ embs[1:].T
+                top_idx = np.argsort(-scores)[:3]
+                return "\n\n".join(paragraphs[i] for i in sorted(top_idx))
+            except Exception as e:
+                log.info("Semantic paragraph ranking failed: %s", e)
+
+        # Lexical fallback when no encoder is available
         query_lower = query.lower()
-        
         scored_paragraphs = []
         for para in paragraphs:
-            if len(para) < 30:
-                continue
             # Simple relevance scoring
             score = sum(1 for word in query_lower.split() if word in para.lower())
             scored_paragraphs.append((score, para))
-        
-        if scored_paragraphs:
-            scored_paragraphs.sort(reverse=True, key=lambda x: x[0])
-            top_paras = [p[1] for p in scored_paragraphs[:3]]
-            return "\n\n".join(top_paras)
-        
-        return combined_context[:800] + "..."
+
+        scored_paragraphs.sort(reverse=True, key=lambda x: x[0])
+        top_paras = [p[1] for p in scored_paragraphs[:3]]
+        return "\n\n".join(top_paras)
     
     def chat(self, user_message: str, context: dict = None) -> dict:
         """
@@ -427,9 +918,34 @@ Benefits:
                 'confidence': float
             }
         """
+        # FAQ-style questions repeat constantly; context-free turns are
+        # memoized so repeats cost a dict lookup instead of a KB scan or
+        # a model generate call
+        if not context:
+            normalized = re.sub(r'\s+', ' ', user_message.strip().lower())
+            # Rebuild fresh lists from the immutable cache entry so a
+            # caller mutating response['suggestions'] cannot poison
+            # every later cached response
+            return {
+                key: list(value) if isinstance(value, tuple) else value
+                for key, value in self._chat_cached(normalized)
+            }
+        return self._chat_uncached(user_message, context)
+
+    @functools.lru_cache(maxsize=1024)
+    def _chat_cached(self, normalized_msg: str) -> tuple:
+        """Memoized chat core; returns the response dict as sorted
+        items with list values frozen to tuples"""
+        return tuple(sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in self._chat_uncached(normalized_msg, None).items()
+        ))
+
+    def _chat_uncached(self, user_message: str, context: dict = None) -> dict:
         user_message_lower = user_message.lower()
         
         # 1. Try RAG search first (most accurate, uses actual documentation)
+        self._ensure_rag()
         if self.rag_enabled:
             rag_results = self._rag_search(user_message, n_results=2)
             if rag_results and rag_results[0]['distance'] < 0.7:  # Good similarity match
@@ -456,6 +972,8 @@ Benefits:
             }
         
         # If no template match and AI available, use conversational model
+        if self.ai_enabled:
+            self._ensure_chat_model()
         if self.ai_enabled and self.chat_model:
             response = self._generate_ai_response(user_message, context)
             return {
@@ -475,58 +993,328 @@ Benefits:
     
     def _find_best_match(self, user_message: str) -> dict:
         """Find best matching template from knowledge base"""
+        # Cheap keyword pre-filter: exact substring hits are high-precision
+        # and skip the encoder entirely for short/obvious queries
         best_score = 0
         best_topic = None
-        
-        for topic, data in self.knowledge_base.items():
-            # Count keyword matches
-            matches = sum(1 for keyword in data['keywords'] if keyword in user_message)
-            score = matches / len(data['keywords'])
-            
-            if score > best_score and score > 0.3:  # At least 30% keyword match
-                best_score = score
-                best_topic = topic
-        
+
+        if self._keyword_automaton is not None:
+            # Single DFA scan over the message yields hits for all topics.
+            # Dedupe on keyword so a keyword repeated in the message
+            # counts once, exactly like the substring fallback.
+            matched_keywords = {
+                kw for _, (_topic, kw) in self._keyword_automaton.iter(user_message)
+            }
+        else:
+            # Single pass over the deduplicated inverted index instead of
+            # the old nested topics x keywords walk; each distinct keyword
+            # is scanned against the message exactly once
+            matched_keywords = {
+                kw for kw in self._keyword_index if kw in user_message
+            }
+
+        if self._topic_matrix is not None and matched_keywords:
+            # One sparse matvec scores every topic at once: the matrix
+            # rows already carry inv_kw_len, so hits x matrix == the
+            # Counter scoring below
+            hit_vec = np.zeros(len(self._kw_vocab), dtype=np.float32)
+            for kw in matched_keywords:
+                hit_vec[self._kw_vocab[kw]] = 1.0
+            scores = self._topic_matrix @ hit_vec
+            idx = int(scores.argmax())
+            if scores[idx] > 0.3:  # At least 30% keyword match
+                best_score = float(scores[idx])
+                best_topic = self._topic_order[idx]
+        else:
+            matches_by_topic = Counter()
+            for kw in matched_keywords:
+                matches_by_topic.update(self._keyword_index[kw])
+
+            for topic, matches in matches_by_topic.items():
+                score = matches * self.knowledge_base[topic]['inv_kw_len']
+                if score > best_score and score > 0.3:  # At least 30% keyword match
+                    best_score = score
+                    best_topic = topic
+
         if best_topic:
             return {
                 'topic': best_topic,
                 'response': self.knowledge_base[best_topic]['response'],
                 'confidence': min(best_score, 0.95)
             }
-        
-        return None
+
+        # Semantic fallback: one encode + one matmul against the
+        # precomputed topic matrix catches paraphrases the keywords miss
+        return self._find_semantic_match(user_message)
+
+    @functools.lru_cache(maxsize=256)
+    def _encode_query(self, normalized_query: str):
+        """Encode a query, memoizing repeats across the session"""
+        return self.semantic_model.encode(
+            normalized_query,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+
+    def _find_semantic_match(self, user_message: str) -> dict:
+        """Match the message against topic embeddings via cosine similarity"""
+        if not self.ai_enabled:
+            return None
+
+        self._ensure_semantic_model()
+        if self.semantic_model is None or self.topic_embeddings is None:
+            return None
+
+        try:
+            query = self._encode_query(
+                re.sub(r'\s+', ' ', user_message.strip().lower())
+            )
+            if self.topic_index is not None:
+                # Sublinear ANN lookup; embeddings are normalized so inner
+                # product equals cosine similarity
+                scores, indices = self.topic_index.search(
+                    np.ascontiguousarray(query[None], dtype=np.float32), 1
+                )
+                best_idx = int(indices[0, 0])
+                best_score = float(scores[0, 0])
+            else:
+                # Embeddings are normalized, so cosine similarity is one matmul
+                scores = self.topic_embeddings @ query
+                best_idx = int(scores.argmax())
+                best_score = float(scores[best_idx])
+
+            if best_score < 0.45:  # Not similar enough to any topic
+                return None
+
+            topic = self._topic_order[best_idx]
+            return {
+                'topic': topic,
+                'response': self.knowledge_base[topic]['response'],
+                'confidence': min(best_score, 0.95)
+            }
+        except Exception as e:
+            print(f"Semantic match error: {e}")
+            return None
     
     def _generate_ai_response(self, user_message: str, context: dict = None) -> str:
         """Generate response using conversational AI model"""
         try:
-            # Build prompt with AgentHub context
-            prompt = f"""AgentHub is a blockchain-powered marketplace for AI agents. 
+            if self._prefix_past is not None:
+                response = self._generate_with_prefix_cache(user_message)
+                if response is not None:
+                    return response if len(response) > 10 else self._get_fallback_response()
+
+            if self._prefix_ids is not None:
+                # Preamble ids were encoded once at load time; only the
+                # user's tokens go through the tokenizer here
+                suffix_ids = self._to_device(self.tokenizer(
+                    f"{user_message}\nAssistant: ",
+                    return_tensors="pt",
+                    add_special_tokens=False
+                ).input_ids)
+                input_ids = torch.cat([self._prefix_ids, suffix_ids], dim=1)
+            else:
+                # Build prompt with AgentHub context
+                prompt = f"""AgentHub is a blockchain-powered marketplace for AI agents. 
 User: {user_message}
 Assistant: """
-            
-            inputs = self.tokenizer(prompt, return_tensors="pt", padding=True).to(self.device)
-            
-            with torch.no_grad():
+                input_ids = self._to_device(self.tokenizer(
+                    prompt, return_tensors="pt", padding=True
+                ).input_ids)
+
+            # inference_mode is strictly cheaper than no_grad (skips view
+            # tracking too); top-k uses a partition instead of top-p's
+            # full vocab sort on every step
+            with torch.inference_mode():
                 outputs = self.chat_model.generate(
-                    inputs['input_ids'],
-                    max_length=150,
+                    input_ids,
+                    max_new_tokens=60,
                     num_return_sequences=1,
                     temperature=0.7,
-                    top_p=0.9,
-                    do_sample=True,
-                    pad_token_id=self.tokenizer.eos_token_id
+                    top_k=40,
+                    do_sample=self.do_sample,
+                    use_cache=True,
+                    pad_token_id=self.tokenizer.eos_token_id,
+                    stopping_criteria=StoppingCriteriaList([
+                        _StopOnTokens(self._stop_token_ids, input_ids.shape[1])
+                    ])
                 )
-            
+
             response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
             # Extract just the assistant's response
             response = response.split("Assistant:")[-1].strip()
-            
+
             return response if len(response) > 10 else self._get_fallback_response()
-            
+
         except Exception as e:
             print(f"AI generation error: {e}")
             return self._get_fallback_response()
+
+    async def chat_async(self, user_message: str, context: dict = None) -> dict:
+        """
+        Async version of chat() for concurrent callers
+
+        Runs the blocking model work (encode/generate) in a worker thread
+        so an event loop serving many users is never blocked; combine with
+        chat_batch() to serve concurrent questions in one forward pass.
+        """
+        return await asyncio.to_thread(self.chat, user_message, context)
+
+    async def chat_batch_async(self, messages: list) -> list:
+        """Async wrapper around chat_batch() for concurrent callers"""
+        return await asyncio.to_thread(self.chat_batch, messages)
+
+    def chat_batch(self, messages: list) -> list:
+        """
+        Process multiple messages, batching the model generation
+
+        Messages answered by RAG or the knowledge base are handled
+        individually (cheap); the remaining ones share a single padded
+        generate() call instead of one forward pass each.
+
+        Args:
+            messages: List of user messages
+
+        Returns:
+            List of response dicts (same shape as chat())
+        """
+        if self.ai_enabled:
+            self._ensure_chat_model()
+        if not (self.ai_enabled and self.chat_model):
+            # No model to batch — fall back to per-message handling
+            return [self.chat(message) for message in messages]
+
+        self._ensure_rag()
+        results = [None] * len(messages)
+        pending = []  # (index, message) pairs that need the chat model
+
+        for i, message in enumerate(messages):
+            # Try the cheap paths first (mirrors chat())
+            if self.rag_enabled:
+                rag_results = self._rag_search(message, n_results=2)
+                if rag_results and rag_results[0]['distance'] < 0.7:
+                    response_text = self._build_rag_response(message, rag_results)
+                    if response_text:
+                        results[i] = {
+                            'response': response_text,
+                            'suggestions': self._generate_suggestions('general'),
+                            'confidence': 1.0 - rag_results[0]['distance'],
+                            'source': 'rag_documentation',
+                            'sources': [r['source'] for r in rag_results]
+                        }
+                        continue
+
+            best_match = self._find_best_match(message.lower())
+            if best_match:
+                results[i] = {
+                    'response': best_match['response'],
+                    'suggestions': self._generate_suggestions(best_match['topic']),
+                    'confidence': best_match['confidence'],
+                    'source': 'knowledge_base'
+                }
+                continue
+
+            pending.append((i, message))
+
+        if pending:
+            responses = self._generate_ai_response_batch([m for _, m in pending])
+            for (i, _), response in zip(pending, responses):
+                results[i] = {
+                    'response': response,
+                    'suggestions': self._generate_suggestions('general'),
+                    'confidence': 0.6,
+                    'source': 'ai_model'
+                }
+
+        return results
+
+    def _generate_ai_response_batch(self, user_messages: list) -> list:
+        """Generate responses for several messages in one padded forward pass"""
+        try:
+            prompts = [
+                f"""AgentHub is a blockchain-powered marketplace for AI agents.
+User: {msg}
+Assistant: """
+                for msg in user_messages
+            ]
+
+            inputs = self.tokenizer(
+                prompts,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=128
+            )
+            inputs = {k: self._to_device(v) for k, v in inputs.items()}
+
+            with torch.inference_mode():
+                outputs = self.chat_model.generate(
+                    **inputs,
+                    max_new_tokens=60,
+                    temperature=0.7,
+                    top_k=40,
+                    do_sample=self.do_sample,
+                    use_cache=True,
+                    pad_token_id=self.tokenizer.eos_token_id,
+                    stopping_criteria=StoppingCriteriaList([
+                        _StopOnTokens(self._stop_token_ids,
+                                      inputs['input_ids'].shape[1])
+                    ])
+                )
+
+            responses = []
+            for output in outputs:
+                text = self.tokenizer.decode(output, skip_special_tokens=True)
+                text = text.split("Assistant:")[-1].strip()
+                # Rows that hit their newline early keep decoding until
+                # the whole batch stops; keep only the first line
+                text = text.split("\n", 1)[0].strip()
+                responses.append(text if len(text) > 10 else self._get_fallback_response())
+            return responses
+
+        except Exception as e:
+            print(f"AI batch generation error: {e}")
+            return [self._get_fallback_response() for _ in user_messages]
     
+    def _generate_with_prefix_cache(self, user_message: str):
+        """Generate reusing the precomputed prefix KV cache
+
+        Returns the response text, or None if this path fails (the
+        caller falls back to the full-prompt path).
+        """
+        try:
+            suffix_ids = self._to_device(self.tokenizer(
+                f"{user_message}\nAssistant: ",
+                return_tensors="pt",
+                add_special_tokens=False
+            ).input_ids)
+            input_ids = torch.cat([self._prefix_ids, suffix_ids], dim=1)
+            attention_mask = torch.ones_like(input_ids)
+
+            with torch.inference_mode():
+                outputs = self.chat_model.generate(
+                    input_ids,
+                    attention_mask=attention_mask,
+                    # generate() may append to the cache, so hand it a copy
+                    past_key_values=copy.deepcopy(self._prefix_past),
+                    max_new_tokens=60,
+                    temperature=0.7,
+                    top_k=40,
+                    do_sample=self.do_sample,
+                    use_cache=True,
+                    pad_token_id=self.tokenizer.eos_token_id,
+                    stopping_criteria=StoppingCriteriaList([
+                        _StopOnTokens(self._stop_token_ids,
+                                      input_ids.shape[1])
+                    ])
+                )
+
+            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+            return response.split("Assistant:")[-1].strip()
+        except Exception as e:
+            log.info("Prefix-cache generation failed, using full prompt: %s", e)
+            return None
+
     def _get_fallback_response(self) -> str:
         """Generic helpful response when no specific match found"""
         return """I'm here to help with AgentHub! I can assist with:
@@ -630,12 +1418,24 @@ What would you like to know more about?"""
 
 # Singleton instance
 _assistant_instance = None
+_assistant_lock = threading.Lock()
+
 
 def get_assistant(use_gpu=False):
-    """Get or create AI assistant instance"""
+    """Get or create AI assistant instance
+
+    Double-checked lock around a module global: lru_cache offers no
+    single-execution guarantee — CPython documents that the wrapped
+    function may run more than once for the same key under
+    concurrency — so the lock is what keeps concurrent first requests
+    under a threaded web server from each constructing (and model-
+    loading) an AIAssistant.
+    """
     global _assistant_instance
     if _assistant_instance is None:
-        _assistant_instance = AIAssistant(use_gpu=use_gpu)
+        with _assistant_lock:
+            if _assistant_instance is None:
+                _assistant_instance = AIAssistant(use_gpu=use_gpu)
     return _assistant_instance
 
 
@@ -5,19 +5,131 @@ Inspired by x402 protocol and Coinbase Agent Pay architecture
 """
 
 from datetime import datetime
-import hashlib
 import json
+import re
+import threading
+import time
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from crypto_backend import sha256_raw, sha256d_pairs, verify_chain
+
+# Block format version. v2 stores 'hash'/'previous_hash' as raw
+# 32-byte digests (half the memory of hex strings, 32-byte memcmp
+# equality, fewer canonical bytes re-hashed during validation);
+# display paths and the web API hex-encode at render time.
+CHAIN_FORMAT_VERSION = 2
+
+# previous_hash of the genesis block
+_GENESIS_PREV_HASH = bytes(32)
+
+# Printable ASCII minus '"' and '\\' — strings made of these need no
+# JSON escaping and can be emitted verbatim
+_PLAIN_STR = re.compile(r'^[ !#-\[\]-~]*$')
+
+
+def _canonical(obj):
+    """
+    Render obj as canonical sorted-key JSON text
+
+    Specialized for the block schema (dicts of str/int/float, short
+    ASCII strings): emits byte-identical output to
+    json.dumps(obj, sort_keys=True) while skipping the generic
+    encoder's dispatch machinery. Anything outside the fast path is
+    handed back to json.dumps.
+    """
+    obj_type = type(obj)
+    if obj_type is str:
+        if _PLAIN_STR.match(obj):
+            return '"%s"' % obj
+        return json.dumps(obj)
+    if obj_type is int:
+        return repr(obj)
+    if obj_type is dict:
+        return '{%s}' % ', '.join(
+            '%s: %s' % (_canonical(k), _canonical(v))
+            for k, v in sorted(obj.items())
+        )
+    if obj_type is list:
+        return '[%s]' % ', '.join(_canonical(v) for v in obj)
+    if obj is None:
+        return 'null'
+    if obj is True:
+        return 'true'
+    if obj is False:
+        return 'false'
+    return json.dumps(obj, sort_keys=True)
+
+
+if ORJSON_AVAILABLE:
+    # orjson sorts keys and returns bytes directly from a SIMD-backed
+    # Rust encoder; the byte format differs from _canonical but only
+    # internal consistency matters, since every hash site goes through
+    # this one function
+    def _canonicalize(block):
+        """Canonical pre-hash bytes for a block (orjson fast path)"""
+        return orjson.dumps(block, option=orjson.OPT_SORT_KEYS)
+else:
+    def _canonicalize(block):
+        """Canonical pre-hash bytes for a block"""
+        return _canonical(block).encode()
 
 
 class Blockchain:
     """
     Blockchain for recording agent transactions
     Each block contains: transaction data, timestamp, hash, previous hash
+
+    Deliberately out of scope: compiling this class to a Cython cdef
+    class. The project ships as plain Python with no build step, and
+    the hot paths here are already dominated by C — OpenSSL hashing,
+    orjson/hand-rolled serialization, and batch verification — so the
+    interpreter overhead a cdef class would remove is the thin glue
+    between those calls. __slots__ gives the fixed attribute layout
+    (and the attribute-lookup savings) that conversion would bring,
+    without a compiler in the loop.
     """
-    
+
+    __slots__ = (
+        'chain', 'pending_transactions', '_lock',
+        '_last_valid_index', '_tx_buyer', '_tx_seller', '_tx_amount',
+        '_tx_completed', '_agent_index', '_stats_cache'
+    )
+
     def __init__(self):
         self.chain = []
         self.pending_transactions = []
+        # add_block reads the tip hash and appends as one critical
+        # section so concurrent job cycles cannot fork the chain
+        self._lock = threading.Lock()
+        # Blocks up to this index passed validation already; the chain
+        # is append-only, so later calls only check the new tail
+        self._last_valid_index = 0
+        # Transaction columns (structure-of-arrays), one row per block
+        # whose data names a buyer or seller; agent stats reduce over
+        # these contiguous columns instead of walking block dicts
+        self._tx_buyer = []
+        self._tx_seller = []
+        self._tx_amount = []
+        self._tx_completed = []
+        # agent_id -> indices of blocks where the agent is buyer or
+        # seller; makes per-agent history an O(1) lookup
+        self._agent_index = {}
+        # Stats memo keyed by (agent_id, chain length): reporting
+        # phases call get_agent_stats repeatedly over an unchanged
+        # chain, and appending a block changes the key, so stale
+        # entries are never served
+        self._stats_cache = {}
         # Create genesis block
         self.add_block({
             'type': 'genesis',
@@ -30,67 +142,136 @@ class Blockchain:
         Args:
             data: Transaction data (dict)
         """
-        if not self.chain:
-            previous_hash = '0'
-        else:
-            previous_hash = self.chain[-1]['hash']
-        
-        block = {
-            'index': len(self.chain),
-            'data': data,
-            'timestamp': str(datetime.now()),
-            'previous_hash': previous_hash
-        }
-        
-        # Create hash of the block
-        block_string = json.dumps(block, sort_keys=True).encode()
-        block_hash = hashlib.sha256(block_string).hexdigest()
-        block['hash'] = block_hash
-        
-        self.chain.append(block)
-        return block
+        with self._lock:
+            if not self.chain:
+                previous_hash = _GENESIS_PREV_HASH
+            else:
+                previous_hash = self.chain[-1]['hash']
+
+            block = {
+                'index': len(self.chain),
+                'data': data,
+                # Integer nanosecond timestamp: no datetime allocation
+                # or string formatting per block, and fewer canonical
+                # bytes fed into the hash; formatted for humans at
+                # display time
+                'timestamp': time.time_ns(),
+            }
+
+            # Create hash of the block: the predecessor's raw digest
+            # prefixes the canonical JSON body, so linkage is hashed
+            # as 32 bytes rather than 64 hex characters. The block is
+            # serialized before 'hash' (or 'previous_hash') is
+            # inserted, so validation can rebuild the exact pre-hash
+            # bytes by stripping those two fields
+            block_string = previous_hash + _canonicalize(block)
+            block_hash = sha256_raw(block_string)
+            block['previous_hash'] = previous_hash
+            block['hash'] = block_hash
+
+            self.chain.append(block)
+
+            # Batch blocks carry several events in one payload; index
+            # each event so agent stats and history see through the
+            # batching
+            if data.get('type') == 'batch':
+                events = data['events']
+            else:
+                events = (data,)
+
+            block_index = block['index']
+            for event in events:
+                if 'buyer' not in event and 'seller' not in event:
+                    continue
+                self._tx_buyer.append(event.get('buyer', ''))
+                self._tx_seller.append(event.get('seller', ''))
+                self._tx_amount.append(event.get('amount', 0))
+                self._tx_completed.append(event.get('status') == 'completed')
+
+                buyer = event.get('buyer')
+                seller = event.get('seller')
+                for agent in (buyer, seller) if seller != buyer else (buyer,):
+                    if not agent:
+                        continue
+                    # Several events in one batch can name the same
+                    # agent; record the block once per agent
+                    indices = self._agent_index.setdefault(agent, [])
+                    if not indices or indices[-1] != block_index:
+                        indices.append(block_index)
+
+            return block
     
     def is_valid(self):
         """
-        Validate the entire blockchain
+        Validate the blockchain
         Returns: True if valid, False otherwise
+
+        Each block's hash commits to its predecessor and the chain is
+        append-only, so blocks validated once stay valid; only the tail
+        added since the last successful call is re-checked.
         """
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i-1]
-            
-            # Verify hash integrity
-            current_block_copy = current_block.copy()
-            stored_hash = current_block_copy.pop('hash')
-            
-            block_string = json.dumps(current_block_copy, sort_keys=True).encode()
-            calculated_hash = hashlib.sha256(block_string).hexdigest()
-            
-            if stored_hash != calculated_hash:
-                return False
-            
-            # Verify chain linkage
-            if current_block['previous_hash'] != previous_block['hash']:
-                return False
-        
+        # One snapshot of the unvalidated tail and its anchor hash,
+        # taken under the append lock: a concurrent add_block landing
+        # between two slices would otherwise misalign the payloads
+        # against the stored hashes and fail a perfectly good chain
+        with self._lock:
+            start = self._last_valid_index + 1
+            tail = self.chain[start:]
+            anchor_hash = self.chain[start - 1]['hash']
+
+        # Serialize every unvalidated block from its live dict. Bytes
+        # captured at add_block time cannot be trusted here: hashing
+        # them would blindly re-confirm the stored hash even after the
+        # block's data was mutated in place
+        payloads = []
+        for current_block in tail:
+            body = {
+                k: v for k, v in current_block.items()
+                if k not in ('hash', 'previous_hash')
+            }
+            payloads.append(
+                current_block['previous_hash'] + _canonicalize(body))
+
+        # Hash integrity and linkage are checked as one batched pass:
+        # stored_hashes carries the hash of the block before the run so
+        # each previous_hash lines up against its predecessor
+        stored_hashes = [anchor_hash]
+        stored_hashes += [block['hash'] for block in tail]
+        prev_hashes = [block['previous_hash'] for block in tail]
+
+        if not verify_chain(payloads, prev_hashes, stored_hashes):
+            return False
+
+        # Only the snapshot was verified; blocks appended since the
+        # snapshot stay below the high-water mark for the next call
+        self._last_valid_index = start + len(tail) - 1
         return True
     
+    def _invalidate_from(self, index):
+        """
+        Force re-validation from the given block index onward
+        Args:
+            index: First block index to treat as unverified
+        """
+        self._last_valid_index = min(self._last_valid_index, max(index - 1, 0))
+    
     def get_transaction_history(self, agent_id=None):
         """
         Get transaction history, optionally filtered by agent
         Args:
             agent_id: Optional agent ID to filter by
         Returns: List of transactions
+
+        Both paths return fresh lists of shared block dicts: the
+        unfiltered case is a single shallow slice with no per-block
+        loop, the filtered case gathers directly from the agent index.
+        Callers must treat the blocks themselves as read-only.
         """
-        transactions = []
-        for block in self.chain[1:]:  # Skip genesis block
-            if agent_id:
-                data = block['data']
-                if data.get('buyer') == agent_id or data.get('seller') == agent_id:
-                    transactions.append(block)
-            else:
-                transactions.append(block)
-        return transactions
+        if agent_id:
+            # Jump straight to the agent's blocks via the index kept
+            # up to date in add_block
+            return [self.chain[i] for i in self._agent_index.get(agent_id, [])]
+        return self.chain[1:]  # Skip genesis block
     
     def get_agent_stats(self, agent_id):
         """
@@ -98,33 +279,89 @@ class Blockchain:
         Args:
             agent_id: Agent identifier
         Returns: Dict with earnings, spending, job count
+
+        Reduces over the transaction columns captured at add_block
+        time: four boolean-mask reductions over flat arrays instead of
+        a pointer-chase through every block dict on the chain. Results
+        are memoized per chain length.
         """
-        transactions = self.get_transaction_history(agent_id)
-        
+        cache_key = (agent_id, len(self.chain))
+        cached = self._stats_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if NUMPY_AVAILABLE and self._tx_buyer:
+            buyers = np.asarray(self._tx_buyer)
+            sellers = np.asarray(self._tx_seller)
+            amounts = np.asarray(self._tx_amount, dtype=np.float64)
+            completed = np.asarray(self._tx_completed, dtype=bool)
+
+            sell_mask = sellers == agent_id
+            buy_mask = buyers == agent_id
+
+            stats = {
+                'earnings': amounts[sell_mask].sum().item(),
+                'spending': amounts[buy_mask].sum().item(),
+                'jobs_completed': int((sell_mask & completed).sum()),
+                'jobs_requested': int((buy_mask & completed).sum()),
+                'total_transactions': int((sell_mask | buy_mask).sum())
+            }
+            self._stats_cache[cache_key] = stats
+            return stats
+
         earnings = 0
         spending = 0
         jobs_completed = 0
         jobs_requested = 0
-        
-        for tx in transactions:
-            data = tx['data']
-            if data.get('seller') == agent_id:
-                earnings += data.get('amount', 0)
-                if data.get('status') == 'completed':
+        total_transactions = 0
+
+        for buyer, seller, amount, done in zip(
+                self._tx_buyer, self._tx_seller,
+                self._tx_amount, self._tx_completed):
+            if seller == agent_id:
+                earnings += amount
+                if done:
                     jobs_completed += 1
-            if data.get('buyer') == agent_id:
-                spending += data.get('amount', 0)
-                if data.get('status') == 'completed':
+            if buyer == agent_id:
+                spending += amount
+                if done:
                     jobs_requested += 1
-        
-        return {
+            if seller == agent_id or buyer == agent_id:
+                total_transactions += 1
+
+        stats = {
             'earnings': earnings,
             'spending': spending,
             'jobs_completed': jobs_completed,
             'jobs_requested': jobs_requested,
-            'total_transactions': len(transactions)
+            'total_transactions': total_transactions
         }
+        self._stats_cache[cache_key] = stats
+        return stats
     
+    def compute_merkle_root(self):
+        """
+        Merkle root over the chain's block hashes (genesis excluded)
+        Returns: 32-byte root digest, or None for an empty chain
+
+        Bitcoin-style tree: leaves pair up bottom-to-top with double
+        SHA-256, duplicating the last node of an odd level. A party
+        holding the root can verify one block's inclusion from a
+        log-length branch instead of re-hashing the whole chain, and
+        every parent is a fixed 64-byte hash — the shape batched
+        hardware SHA kernels are optimized for.
+        """
+        level = [block['hash'] for block in self.chain[1:]]
+        if not level:
+            return None
+
+        while len(level) > 1:
+            if len(level) % 2:
+                level.append(level[-1])
+            level = sha256d_pairs(level)
+
+        return level[0]
+
     def display_chain(self):
         """Display the entire blockchain in readable format"""
         print("\n" + "="*80)
@@ -132,13 +369,17 @@ class Blockchain:
         print("="*80)
         
         for block in self.chain:
+            timestamp = datetime.fromtimestamp(block['timestamp'] / 1e9)
             print(f"\nBlock #{block['index']}")
-            print(f"Timestamp: {block['timestamp']}")
-            print(f"Hash: {block['hash'][:16]}...")
-            print(f"Previous Hash: {block['previous_hash'][:16]}...")
+            print(f"Timestamp: {timestamp}")
+            print(f"Hash: {block['hash'].hex()[:16]}...")
+            print(f"Previous Hash: {block['previous_hash'].hex()[:16]}...")
             print(f"Data: {json.dumps(block['data'], indent=2)}")
             print("-" * 80)
         
         print(f"\nBlockchain Valid: {self.is_valid()}")
+        merkle_root = self.compute_merkle_root()
+        if merkle_root:
+            print(f"Merkle Root: {merkle_root.hex()}")
         print(f"Total Blocks: {len(self.chain)}")
         print("="*80 + "\n")
@@ -12,12 +12,24 @@ Course: AI in Blockchain
 Date: November 2025
 """
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 from blockchain import Blockchain
 from smart_contract import SmartContract
 from agent import Agent
 from ai_validator import AIValidator
 from marketplace import Marketplace
-import time
+
+# Agent activity is logged; show it like the old print output.
+# Benchmarks can raise the level to WARNING to silence the hot paths.
+logging.basicConfig(level=logging.INFO, format="%(message)s")
 
 
 def print_header(text):
@@ -97,49 +109,45 @@ def simulate_agent_economy():
     data_analyst.display_profile()
     image_gen.display_profile()
     
-    # Run multiple job cycles
+    # Run multiple job cycles concurrently: the cycles are independent
+    # apart from blockchain appends and wallet updates, both of which
+    # are lock-protected, so their Python-heavy work overlaps
     print_header("PHASE 3: AUTONOMOUS TRANSACTIONS")
-    
-    # Transaction 1: Data Analysis
-    print("\n" + "~"*80)
-    print("TRANSACTION 1: DATA ANALYSIS")
-    print("~"*80)
-    
-    success1 = marketplace.run_full_job_cycle(
-        poster_id="ResearchBot",
-        job_description="Analyze customer satisfaction survey data (500 responses)",
-        job_type="data_analysis",
-        budget=15
-    )
-    
-    time.sleep(1)
-    
-    # Transaction 2: Image Generation
-    print("\n" + "~"*80)
-    print("TRANSACTION 2: IMAGE GENERATION")
-    print("~"*80)
-    
-    success2 = marketplace.run_full_job_cycle(
-        poster_id="ResearchBot",
-        job_description="Generate product visualization for marketing campaign",
-        job_type="image_generation",
-        budget=12
-    )
-    
-    time.sleep(1)
-    
-    # Transaction 3: Another Data Analysis
-    print("\n" + "~"*80)
-    print("TRANSACTION 3: DATA ANALYSIS (ROUND 2)")
-    print("~"*80)
-    
-    success3 = marketplace.run_full_job_cycle(
-        poster_id="ResearchBot",
-        job_description="Perform sentiment analysis on social media mentions",
-        job_type="data_analysis",
-        budget=14
-    )
-    
+
+    transactions = [
+        ("TRANSACTION 1: DATA ANALYSIS",
+         "Analyze customer satisfaction survey data (500 responses)",
+         "data_analysis", 15),
+        ("TRANSACTION 2: IMAGE GENERATION",
+         "Generate product visualization for marketing campaign",
+         "image_generation", 12),
+        ("TRANSACTION 3: DATA ANALYSIS (ROUND 2)",
+         "Perform sentiment analysis on social media mentions",
+         "data_analysis", 14),
+    ]
+
+    for title, _, _, _ in transactions:
+        print("\n" + "~"*80)
+        print(title)
+        print("~"*80)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(
+                marketplace.run_full_job_cycle,
+                poster_id="ResearchBot",
+                job_description=description,
+                job_type=job_type,
+                budget=budget
+            )
+            for _, description, job_type, budget in transactions
+        ]
+        success1, success2, success3 = [future.result() for future in futures]
+
+    # Drain the contract event queue so the ledger below reflects
+    # every escrow and settlement event
+    smart_contract.flush()
+
     # Display final results
     print_header("PHASE 4: FINAL RESULTS & VERIFICATION")
     
@@ -165,16 +173,42 @@ def simulate_agent_economy():
     # Generate summary report
     print_header("EXECUTIVE SUMMARY")
     
+    # Materialize the completed-jobs view once and reduce over flat
+    # arrays rather than per-element generator sums. Every job can
+    # fail validation, so both branches guard the empty case
+    completed_jobs = marketplace.completed_jobs
+    if not completed_jobs:
+        total_value = 0
+        avg_value = 0.0
+        avg_quality = 0.0
+    elif NUMPY_AVAILABLE:
+        prices = np.fromiter(
+            (job['final_price'] for job in completed_jobs), dtype=np.float64)
+        qualities = np.fromiter(
+            (job.get('quality_score', 0) for job in completed_jobs),
+            dtype=np.float64)
+        total_value = prices.sum().item()
+        avg_value = prices.mean().item()
+        avg_quality = qualities.mean().item()
+    else:
+        total_value = sum(job['final_price'] for job in completed_jobs)
+        avg_value = total_value / len(completed_jobs)
+        avg_quality = sum(
+            job.get('quality_score', 0) for job in completed_jobs
+        ) / len(completed_jobs)
+
     print("🎯 KEY ACHIEVEMENTS:")
-    print(f"   ✅ {len(marketplace.completed_jobs)} autonomous transactions completed")
+    print(f"   ✅ {len(completed_jobs)} autonomous transactions completed")
     print(f"   ✅ {len(blockchain.chain)} blocks on blockchain (immutable)")
     print(f"   ✅ {len(smart_contract.contract_history)} smart contracts executed")
     print(f"   ✅ 100% blockchain validation passed")
-    
+
     print("\n💰 ECONOMIC ACTIVITY:")
-    total_value = sum(job['final_price'] for job in marketplace.completed_jobs)
-    print(f"   Total Transaction Volume: {total_value} tokens")
-    print(f"   Average Transaction: {total_value / len(marketplace.completed_jobs):.2f} tokens")
+    if completed_jobs:
+        print(f"   Total Transaction Volume: {total_value} tokens")
+        print(f"   Average Transaction: {avg_value:.2f} tokens")
+    else:
+        print("   No jobs passed validation this run — no payments released")
     
     print("\n🤖 AGENT PERFORMANCE:")
     for agent_id, agent in marketplace.agents.items():
@@ -186,8 +220,10 @@ def simulate_agent_economy():
             print(f"     - Total Earned: {stats['total_earned']} tokens")
     
     print("\n⭐ QUALITY METRICS:")
-    avg_quality = sum(job.get('quality_score', 0) for job in marketplace.completed_jobs) / len(marketplace.completed_jobs)
-    print(f"   Average Work Quality: {avg_quality:.1f}/100")
+    if completed_jobs:
+        print(f"   Average Work Quality: {avg_quality:.1f}/100")
+    else:
+        print("   Average Work Quality: N/A (no completed jobs)")
     print(f"   Validator Pass Rate: {validator.get_validation_stats()['pass_rate']}%")
     
     print("\n🔐 SECURITY & TRUST:")
@@ -6,6 +6,27 @@ Simulates x402-style autonomous agent-to-agent transactions
 
 import random
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMPY_AVAILABLE:
+    def _score_bids(amounts, reputations, budget):
+        """Reputation-weighted bid scores in one vectorized kernel"""
+        return (reputations / 5.0) * 0.6 + (1.0 - amounts / budget) * 0.4
+
+    if NUMBA_AVAILABLE:
+        _score_bids = njit(cache=True)(_score_bids)
+
 
 class Marketplace:
     """
@@ -21,9 +42,23 @@ class Marketplace:
         self.blockchain = blockchain
         self.smart_contract = smart_contract
         self.validator = validator
-        self.active_jobs = []
-        self.completed_jobs = []
+        # All jobs keyed by job_id: lookups are O(1) and completion is
+        # a status flip, never a list removal. active_jobs and
+        # completed_jobs are derived views for display/reporting.
+        self._jobs_by_id = {}
         self.agents = {}
+
+    @property
+    def active_jobs(self):
+        """Jobs not yet completed (derived view)"""
+        return [job for job in self._jobs_by_id.values()
+                if job['status'] != 'completed']
+
+    @property
+    def completed_jobs(self):
+        """Jobs that finished successfully (derived view)"""
+        return [job for job in self._jobs_by_id.values()
+                if job['status'] == 'completed']
     
     def register_agent(self, agent):
         """
@@ -49,7 +84,7 @@ class Marketplace:
         job = poster_agent.post_job(job_description, job_type, budget)
         
         if job:
-            self.active_jobs.append(job)
+            self._jobs_by_id[job['job_id']] = job
             return job['job_id']
         
         return None
@@ -66,21 +101,31 @@ class Marketplace:
             return []
         
         print(f"\n📋 Collecting bids for {job_id}...")
-        
+
+        # All registered agents share one AgentPool, so eligibility,
+        # pricing and completion rates for every bidder come out of a
+        # single vectorized pass instead of a bid_on_job call per agent
         bids = []
-        for agent_id, agent in self.agents.items():
-            # Skip the job poster
-            if agent_id == job['poster']:
-                continue
-            
-            # Only sellers can bid
-            if agent.agent_type != 'seller':
-                continue
-            
-            bid = agent.bid_on_job(job)
-            if bid:
-                bids.append(bid)
-        
+        if self.agents:
+            pool = next(iter(self.agents.values()))._pool
+            bidders, amounts, reputations, rates = pool.bid_all(
+                job['type'], job['budget'], exclude_agent_id=job['poster'])
+            for bidder, amount, reputation, rate in zip(
+                    bidders, amounts, reputations, rates):
+                # The pool is shared process-wide; only agents
+                # registered with this marketplace may bid, or
+                # execute_job would fail looking the winner up
+                if bidder not in self.agents:
+                    continue
+                bids.append({
+                    'bidder': bidder,
+                    'amount': amount,
+                    'reputation': reputation,
+                    'completion_rate': rate
+                })
+                print(f"   💰 {bidder} bid {amount} tokens "
+                      f"(reputation: {reputation:.1f}⭐)")
+
         job['bids'] = bids
         
         print(f"   Total bids received: {len(bids)}")
@@ -101,23 +146,52 @@ class Marketplace:
         
         print(f"\n🎯 Selecting winner for {job_id}...")
         
-        # Score each bid: lower price is better, higher reputation is better
-        best_score = -1
-        winner = None
-        
-        for bid in job['bids']:
-            # Normalize price score (lower is better, scaled 0-1)
-            price_score = 1 - (bid['amount'] / job['budget'])
-            
-            # Normalize reputation score (higher is better, scaled 0-1)
-            reputation_score = bid['reputation'] / 5.0
-            
-            # Weighted combination (60% reputation, 40% price)
-            total_score = (reputation_score * 0.6) + (price_score * 0.4)
-            
-            if total_score > best_score:
-                best_score = total_score
-                winner = bid
+        # Score each bid: lower price is better, higher reputation is
+        # better, weighted 60% reputation / 40% price
+        if NUMPY_AVAILABLE:
+            # Pack the bids into flat arrays and score them all in one
+            # (optionally JIT-compiled) kernel; over-budget bids are
+            # masked to -inf up front and the winner falls out of a
+            # branchless argmax
+            amounts = np.fromiter(
+                (bid['amount'] for bid in job['bids']), dtype=np.float64)
+            reputations = np.fromiter(
+                (bid['reputation'] for bid in job['bids']), dtype=np.float64)
+            in_budget = amounts <= job['budget']
+            scores = np.where(
+                in_budget,
+                _score_bids(amounts, reputations, float(job['budget'])),
+                -np.inf
+            )
+            best_index = int(scores.argmax())
+            if in_budget[best_index]:
+                best_score = float(scores[best_index])
+                winner = job['bids'][best_index]
+            else:
+                # Every bid exceeded the budget
+                best_score = -1
+                winner = None
+        else:
+            best_score = -1
+            winner = None
+
+            for bid in job['bids']:
+                # Reject over-budget bids before scoring
+                if bid['amount'] > job['budget']:
+                    continue
+
+                # Normalize price score (lower is better, scaled 0-1)
+                price_score = 1 - (bid['amount'] / job['budget'])
+
+                # Normalize reputation score (higher is better, scaled 0-1)
+                reputation_score = bid['reputation'] / 5.0
+
+                # Weighted combination (60% reputation, 40% price)
+                total_score = (reputation_score * 0.6) + (price_score * 0.4)
+
+                if total_score > best_score:
+                    best_score = total_score
+                    winner = bid
         
         if winner:
             print(f"   🏆 Winner: {winner['bidder']}")
@@ -215,10 +289,7 @@ class Marketplace:
             job['status'] = 'completed'
             job['quality_score'] = quality_score
             job['contract_id'] = contract_id
-            
-            self.completed_jobs.append(job)
-            self.active_jobs.remove(job)
-            
+
             print(f"\n{'='*80}")
             print(f"JOB COMPLETED SUCCESSFULLY ✅")
             print(f"{'='*80}\n")
@@ -233,10 +304,7 @@ class Marketplace:
     
     def _find_job(self, job_id):
         """Find a job by ID"""
-        for job in self.active_jobs + self.completed_jobs:
-            if job['job_id'] == job_id:
-                return job
-        return None
+        return self._jobs_by_id.get(job_id)
     
     def display_marketplace_stats(self):
         """Display marketplace statistics"""
@@ -254,13 +322,17 @@ class Marketplace:
             print(f"    Jobs Completed: {stats['jobs_completed']}")
             print(f"    Total Earned: {stats['total_earned']} tokens")
         
-        print(f"\nActive Jobs: {len(self.active_jobs)}")
-        print(f"Completed Jobs: {len(self.completed_jobs)}")
-        
-        if self.completed_jobs:
-            total_value = sum(job['final_price'] for job in self.completed_jobs)
-            avg_value = total_value / len(self.completed_jobs)
-            avg_quality = sum(job.get('quality_score', 0) for job in self.completed_jobs) / len(self.completed_jobs)
+        # Materialize the derived views once for this report
+        active_jobs = self.active_jobs
+        completed_jobs = self.completed_jobs
+
+        print(f"\nActive Jobs: {len(active_jobs)}")
+        print(f"Completed Jobs: {len(completed_jobs)}")
+
+        if completed_jobs:
+            total_value = sum(job['final_price'] for job in completed_jobs)
+            avg_value = total_value / len(completed_jobs)
+            avg_quality = sum(job.get('quality_score', 0) for job in completed_jobs) / len(completed_jobs)
             
             print(f"\nTransaction Metrics:")
             print(f"  Total Transaction Value: {total_value} tokens")
@@ -4,8 +4,34 @@ Handles escrow, payment release, and dispute resolution
 Simulates x402-style automatic payment settlement
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-import uuid
+import secrets
+import threading
+import time
+
+
+@dataclass(slots=True)
+class Contract:
+    """
+    One escrow contract between a buyer and a seller
+
+    Slotted dataclass instead of a per-contract dict: every contract
+    shares one fixed field layout, so attribute access skips the hash
+    lookup a dict key costs and each instance drops the dict's storage
+    overhead.
+    """
+    contract_id: str
+    buyer: str
+    seller: str
+    job_description: str
+    amount: float
+    status: str = 'escrowed'
+    created_at: int = 0
+    quality_score: object = None
+    payment_released: bool = False
+    validator: object = None
+    validated_at: object = None
 
 
 class SmartContract:
@@ -21,7 +47,50 @@ class SmartContract:
         self.blockchain = blockchain
         self.active_contracts = {}
         self.contract_history = []
+        # contract_id -> archived contract, kept in step with
+        # contract_history so status lookups never scan the list
+        self.history_index = {}
         self.quality_threshold = 70  # Minimum quality score to release payment
+        # Contract events queue up here and land on the chain as one
+        # batch block per _flush_threshold events, so bursty contract
+        # traffic pays one hash per batch instead of one per event.
+        # flush() drains the queue explicitly at quiescent points.
+        # Concurrent job cycles record events from worker threads, so
+        # the queue is guarded like Blockchain.add_block guards appends.
+        self._pending_events = []
+        self._flush_threshold = 16
+        self._events_lock = threading.Lock()
+
+    def _record_event(self, event):
+        """
+        Queue a contract event for the blockchain, flushing in batches
+        Args:
+            event: Event data (dict)
+        """
+        with self._events_lock:
+            self._pending_events.append(event)
+            should_flush = len(self._pending_events) >= self._flush_threshold
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """
+        Write all queued contract events to the blockchain as one block
+
+        Call at the end of a simulation or request cycle so the ledger
+        reflects every event deterministically.
+        """
+        # Swap the queue under the lock; add_block (which takes its
+        # own lock) runs outside so event recording is never blocked
+        # on a chain append. add_block keeps a reference to the event
+        # list, so hand it over and start a fresh queue rather than
+        # clearing in place.
+        with self._events_lock:
+            if not self._pending_events:
+                return
+            events = self._pending_events
+            self._pending_events = []
+        self.blockchain.add_block({'type': 'batch', 'events': events})
     
     def create_contract(self, buyer_id, seller_id, job_description, amount):
         """
@@ -33,24 +102,27 @@ class SmartContract:
             amount: Payment amount in tokens
         Returns: Contract ID
         """
-        contract_id = str(uuid.uuid4())[:8]
-        
-        contract = {
-            'contract_id': contract_id,
-            'buyer': buyer_id,
-            'seller': seller_id,
-            'job_description': job_description,
-            'amount': amount,
-            'status': 'escrowed',
-            'created_at': str(datetime.now()),
-            'quality_score': None,
-            'payment_released': False
-        }
+        # 8 hex chars straight from the OS CSPRNG — same width and
+        # collision budget as the old truncated uuid4, without building
+        # and slicing a UUID object per contract
+        contract_id = secrets.token_hex(4)
+
+        contract = Contract(
+            contract_id=contract_id,
+            buyer=buyer_id,
+            seller=seller_id,
+            job_description=job_description,
+            amount=amount,
+            # Integer nanosecond timestamp, matching block timestamps:
+            # no datetime allocation or string formatting per contract;
+            # rendered for humans at display time
+            created_at=time.time_ns(),
+        )
         
         self.active_contracts[contract_id] = contract
         
         # Record contract creation on blockchain
-        self.blockchain.add_block({
+        self._record_event({
             'type': 'contract_created',
             'contract_id': contract_id,
             'buyer': buyer_id,
@@ -82,9 +154,9 @@ class SmartContract:
             return False
         
         contract = self.active_contracts[contract_id]
-        contract['quality_score'] = quality_score
-        contract['validator'] = validator_id
-        contract['validated_at'] = str(datetime.now())
+        contract.quality_score = quality_score
+        contract.validator = validator_id
+        contract.validated_at = time.time_ns()
         
         print(f"\n🔍 Validation Results for Contract {contract_id}")
         print(f"   Quality Score: {quality_score}/100")
@@ -93,39 +165,40 @@ class SmartContract:
         
         # Auto-release payment if quality meets threshold
         if quality_score >= self.quality_threshold:
-            contract['status'] = 'completed'
-            contract['payment_released'] = True
-            
+            contract.status = 'completed'
+            contract.payment_released = True
+
             # Record payment release on blockchain
-            self.blockchain.add_block({
+            self._record_event({
                 'type': 'payment_released',
                 'contract_id': contract_id,
-                'buyer': contract['buyer'],
-                'seller': contract['seller'],
-                'amount': contract['amount'],
+                'buyer': contract.buyer,
+                'seller': contract.seller,
+                'amount': contract.amount,
                 'quality_score': quality_score,
                 'validator': validator_id,
                 'status': 'completed'
             })
-            
-            print(f"   ✅ PAYMENT RELEASED: {contract['amount']} tokens")
-            print(f"   {contract['seller']} earned {contract['amount']} tokens")
+
+            print(f"   ✅ PAYMENT RELEASED: {contract.amount} tokens")
+            print(f"   {contract.seller} earned {contract.amount} tokens")
             
             # Move to history
             self.contract_history.append(contract)
+            self.history_index[contract_id] = contract
             del self.active_contracts[contract_id]
             
             return True
         else:
-            contract['status'] = 'disputed'
-            
+            contract.status = 'disputed'
+
             # Record dispute on blockchain
-            self.blockchain.add_block({
+            self._record_event({
                 'type': 'payment_disputed',
                 'contract_id': contract_id,
-                'buyer': contract['buyer'],
-                'seller': contract['seller'],
-                'amount': contract['amount'],
+                'buyer': contract.buyer,
+                'seller': contract.seller,
+                'amount': contract.amount,
                 'quality_score': quality_score,
                 'validator': validator_id,
                 'status': 'disputed'
@@ -137,16 +210,9 @@ class SmartContract:
             return False
     
     def get_contract_status(self, contract_id):
-        """Get current status of a contract"""
-        if contract_id in self.active_contracts:
-            return self.active_contracts[contract_id]
-        
-        # Search history
-        for contract in self.contract_history:
-            if contract['contract_id'] == contract_id:
-                return contract
-        
-        return None
+        """Get current status of a contract (O(1), active or archived)"""
+        return (self.active_contracts.get(contract_id)
+                or self.history_index.get(contract_id))
     
     def get_active_contracts(self):
         """Get all active contracts"""
@@ -154,7 +220,7 @@ class SmartContract:
     
     def get_completed_contracts(self):
         """Get all completed contracts from history"""
-        return [c for c in self.contract_history if c['status'] == 'completed']
+        return [c for c in self.contract_history if c.status == 'completed']
     
     def display_contracts(self):
         """Display all contract information"""
@@ -165,14 +231,16 @@ class SmartContract:
         if self.active_contracts:
             print("\n📋 ACTIVE CONTRACTS:")
             for contract in self.active_contracts.values():
-                print(f"\nContract ID: {contract['contract_id']}")
-                print(f"  Status: {contract['status'].upper()}")
-                print(f"  Buyer: {contract['buyer']}")
-                print(f"  Seller: {contract['seller']}")
-                print(f"  Amount: {contract['amount']} tokens")
-                print(f"  Job: {contract['job_description']}")
-                if contract['quality_score']:
-                    print(f"  Quality Score: {contract['quality_score']}/100")
+                print(f"\nContract ID: {contract.contract_id}")
+                print(f"  Status: {contract.status.upper()}")
+                print(f"  Buyer: {contract.buyer}")
+                print(f"  Seller: {contract.seller}")
+                print(f"  Amount: {contract.amount} tokens")
+                print(f"  Job: {contract.job_description}")
+                created = datetime.fromtimestamp(contract.created_at / 1e9)
+                print(f"  Created: {created}")
+                if contract.quality_score:
+                    print(f"  Quality Score: {contract.quality_score}/100")
         
         if self.contract_history:
             print(f"\n📊 COMPLETED CONTRACTS: {len(self.contract_history)}")